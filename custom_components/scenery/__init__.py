@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 import contextlib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import wraps
-import itertools
 import logging
 from typing import Any, cast
 
@@ -70,15 +69,21 @@ from .const import (
 )
 from .light_utils import (
     ANY_COLOR_ATTRS,
+    ANY_COLOR_ATTRS_SET,
     COLOR_SCHEMA,
+    COMPARED_STATE_ATTRS,
     FAVORITE_COLOR_SCHEMA,
     Color,
+    NormalizedColor,
     compare_state_to_brightness,
-    compare_state_to_color,
+    compare_state_to_normalized_color,
     effective_brightness,
     extract_color,
     is_favorite_color,
+    normalize_color,
+    same_colors,
     unique_colors,
+    validate_single_color,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -90,47 +95,75 @@ PLATFORMS = [
 
 DEBUG_SCORING = False
 
+# Whether the light Profiles methods have been intercepted in this process
+_profiles_intercepted = False
+
+
+def _find_duplicate(values: list[str]) -> str | None:
+    if len(set(values)) == len(values):
+        return None
+    seen = set()
+    for value in values:
+        if value in seen:
+            return value
+        seen.add(value)
+    return None
+
 
 def _validate_domain(config: ConfigType) -> ConfigType:
-    profile_names = set()
-    for profile_item in config.get(CONF_PROFILES, []):
-        if (name := profile_item[CONF_NAME]) in profile_names:
-            raise vol.Invalid(f"Duplicate profile name '{name}' in profiles/name")
-        profile_names.add(name)
-
-    all_light_profiles = dict()
-    for light_item in config.get(CONF_LIGHTS, []):
-        light_profiles = light_item.get(CONF_PROFILES, [])
-        for name in light_profiles:
-            if name not in profile_names:
-                raise vol.Invalid(f"Unknown profile name '{name}' in lights/profiles")
+    profile_names = [item[CONF_NAME] for item in config.get(CONF_PROFILES, [])]
+    if (name := _find_duplicate(profile_names)) is not None:
+        raise vol.Invalid(f"Duplicate profile name '{name}' in profiles/name")
+    known_profile_names = set(profile_names)
+
+    light_items = config.get(CONF_LIGHTS, [])
+    entity_ids = [
+        entity_id for item in light_items for entity_id in item[CONF_ENTITY_ID]
+    ]
+    if (entity_id := _find_duplicate(entity_ids)) is not None:
+        raise vol.Invalid(f"Duplicate entity ID '{entity_id}' in lights/entity_id")
+    unknown_profile_names = (
+        name
+        for item in light_items
+        for name in item.get(CONF_PROFILES, [])
+        if name not in known_profile_names
+    )
+    if (name := next(unknown_profile_names, None)) is not None:
+        raise vol.Invalid(f"Unknown profile name '{name}' in lights/profiles")
+    for light_item in light_items:
         if (
-            profile_default_name := config.get(CONF_PROFILE_DEFAULT)
-        ) is not None and profile_default_name not in profile_names:
+            profile_default_name := light_item.get(CONF_PROFILE_DEFAULT)
+        ) is not None and profile_default_name not in known_profile_names:
             raise vol.Invalid(
-                f"Unknown profile name '{name}' in lights/profile_default "
+                f"Unknown profile name '{profile_default_name}' "
+                "in lights/profile_default"
             )
-        for entity_id in light_item[CONF_ENTITY_ID]:
-            if entity_id in all_light_profiles:
-                raise vol.Invalid(
-                    f"Duplicate entity ID '{entity_id}' in lights/entity_id"
-                )
-            all_light_profiles[entity_id] = light_profiles
+    all_light_profiles = {
+        entity_id: item.get(CONF_PROFILES, [])
+        for item in light_items
+        for entity_id in item[CONF_ENTITY_ID]
+    }
 
-    scene_group_names = set()
-    for scene_group_item in config.get(CONF_SCENE_GROUPS, []):
-        if (scene_group_name := scene_group_item[CONF_NAME]) in scene_group_names:
+    scene_group_items = config.get(CONF_SCENE_GROUPS, [])
+    if (
+        scene_group_name := _find_duplicate(
+            [item[CONF_NAME] for item in scene_group_items]
+        )
+    ) is not None:
+        raise vol.Invalid(
+            f"Duplicate scene group name '{scene_group_name}' in scene_groups/name"
+        )
+    for scene_group_item in scene_group_items:
+        scene_group_name = scene_group_item[CONF_NAME]
+        scene_items = scene_group_item.get(CONF_SCENES, [])
+        if (
+            scene_name := _find_duplicate([item[CONF_NAME] for item in scene_items])
+        ) is not None:
             raise vol.Invalid(
-                f"Duplicate scene group name '{scene_group_name}' in scene_groups/name"
+                f"Duplicate scene name '{scene_name}' for scene group '{scene_group_name}' in scene_groups/scenes/name"
             )
-        scene_group_names.add(scene_group_name)
-        scene_names = set()
-        for scene_item in scene_group_item.get(CONF_SCENES, []):
-            if (scene_name := scene_item[CONF_NAME]) in scene_names:
-                raise vol.Invalid(
-                    f"Duplicate scene name '{scene_name}' for scene group '{scene_group_name}' in scene_groups/scenes/name"
-                )
-            scene_names.add(scene_name)
+        for scene_item in scene_items:
+            scene_name = scene_item[CONF_NAME]
             for entity_id, state in scene_item[CONF_ENTITIES].items():
                 profile_name = state.attributes.get(ATTR_PROFILE)
                 if profile_name is not None:
@@ -154,16 +187,19 @@ CONFIG_SCHEMA = vol.Schema(
             vol.Schema(
                 {
                     vol.Optional(CONF_PROFILES): [
-                        COLOR_SCHEMA.extend(
-                            {
-                                vol.Required(CONF_NAME): NON_EMPTY_STRING,
-                                vol.Optional(ATTR_BRIGHTNESS): vol.All(
-                                    vol.Coerce(int), vol.Clamp(min=0, max=255)
-                                ),
-                                vol.Optional(ATTR_TRANSITION): vol.All(
-                                    vol.Coerce(float), vol.Clamp(min=0, max=6553)
-                                ),
-                            }
+                        vol.All(
+                            COLOR_SCHEMA.extend(
+                                {
+                                    vol.Required(CONF_NAME): NON_EMPTY_STRING,
+                                    vol.Optional(ATTR_BRIGHTNESS): vol.All(
+                                        vol.Coerce(int), vol.Clamp(min=0, max=255)
+                                    ),
+                                    vol.Optional(ATTR_TRANSITION): vol.All(
+                                        vol.Coerce(float), vol.Clamp(min=0, max=6553)
+                                    ),
+                                }
+                            ),
+                            validate_single_color,
                         )
                     ],
                     vol.Optional(CONF_LIGHTS): [
@@ -251,7 +287,7 @@ SET_FAVORITE_COLORS_SCHEMA = vol.Schema(
 RELOAD_SCHEMA = vol.Schema({})
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class LightProfile:
     """A named preset that can be applied to a light."""
 
@@ -259,10 +295,14 @@ class LightProfile:
     color: Color = None
     brightness: int | None = None
     transition: float | None = None
+    effective_brightness: int | None = field(init=False)
+    normalized_color: NormalizedColor | None = field(init=False)
 
-    @property
-    def effective_brightness(self) -> int | None:
-        return effective_brightness(self.brightness, self.color)
+    def __post_init__(self) -> None:
+        self.effective_brightness = effective_brightness(self.brightness, self.color)
+        self.normalized_color = (
+            normalize_color(self.color) if self.color is not None else None
+        )
 
     def apply(self, params: dict[str, Any], set_color_and_brightness: bool = True):
         if self.transition is not None:
@@ -270,9 +310,7 @@ class LightProfile:
         if set_color_and_brightness:
             if self.brightness is not None:
                 params.setdefault(ATTR_BRIGHTNESS, self.brightness)
-            if self.color is not None and not any(
-                attr in params for attr in ANY_COLOR_ATTRS
-            ):
+            if self.color is not None and ANY_COLOR_ATTRS_SET.isdisjoint(params):
                 params.update(self.color)
 
     @staticmethod
@@ -285,7 +323,7 @@ class LightProfile:
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ProfileSelect:
     """Configures the profile select entity."""
 
@@ -302,33 +340,42 @@ class ProfileSelect:
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class LightConfig:
     """Configures how this integration will interact with a light."""
 
     profiles: list[LightProfile]
+    profile_names: tuple[str, ...]
     profile_default: LightProfile | None
     profile_select: ProfileSelect | None
     favorite_colors: list[Color]
-
-    @property
-    def favorite_colors_from_profiles(self) -> list[Color]:
-        return [
-            profile.color
-            for profile in self.profiles
-            if profile.color is not None and is_favorite_color(profile.color)
-        ]
+    favorite_colors_from_profiles: list[Color]
+    all_favorite_colors: list[Color]
 
     @staticmethod
     def from_config(
-        config: ConfigType, profiles: Mapping[str, LightProfile]
+        config: ConfigType,
+        profiles: Mapping[str, LightProfile],
+        profile_lists: dict[tuple[str, ...], list[LightProfile]],
     ) -> LightConfig:
         profile_names = config.get(CONF_PROFILES, [])
         profile_default_name = config.get(
             CONF_PROFILE_DEFAULT, profile_names[0] if profile_names else None
         )
+        # Share the list of profiles among lights that use the same profiles.
+        if (light_profiles := profile_lists.get(key := tuple(profile_names))) is None:
+            light_profiles = profile_lists[key] = [
+                profiles[name] for name in profile_names
+            ]
+        favorite_colors = config.get(CONF_FAVORITE_COLORS, [])
+        favorite_colors_from_profiles = [
+            profile.color
+            for profile in light_profiles
+            if profile.color is not None and is_favorite_color(profile.color)
+        ]
         return LightConfig(
-            profiles=[profiles[name] for name in profile_names],
+            profiles=light_profiles,
+            profile_names=key,
             profile_default=(
                 profiles[profile_default_name]
                 if profile_default_name is not None
@@ -339,37 +386,60 @@ class LightConfig:
                 if (c := config.get(CONF_PROFILE_SELECT)) is not None
                 else None
             ),
-            favorite_colors=config.get(CONF_FAVORITE_COLORS, []),
+            favorite_colors=favorite_colors,
+            favorite_colors_from_profiles=favorite_colors_from_profiles,
+            all_favorite_colors=unique_colors(
+                [*favorite_colors_from_profiles, *favorite_colors]
+            ),
         )
 
 
-ANY_CRITERION_ATTRS = [*ANY_COLOR_ATTRS, ATTR_BRIGHTNESS, ATTR_PROFILE]
+ANY_CRITERION_ATTRS = frozenset((*ANY_COLOR_ATTRS, ATTR_BRIGHTNESS, ATTR_PROFILE))
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Criterion:
     """A parsed representation of a state that's easier to compare."""
 
+    state: str
+    color: Color | None
+    brightness: int | None
+    profile: str | None
+    attributes: tuple[tuple[str, Any], ...]
+
     def __init__(self, state: State) -> None:
         attrs = state.attributes
-        self.state: str = state.state  # Required
-        self.color: Color | None = extract_color(attrs)
-        self.brightness: int | None = attrs.get(ATTR_BRIGHTNESS)
-        self.profile: str = attrs.get(ATTR_PROFILE)
-        self.attributes: Mapping[str, Any] = {
-            attr: value
+        self.state = state.state  # Required
+        self.color = extract_color(attrs)
+        self.brightness = attrs.get(ATTR_BRIGHTNESS)
+        self.profile = attrs.get(ATTR_PROFILE)
+        self.attributes = tuple(
+            (attr, value)
             for attr, value in attrs.items()
             if attr not in ANY_CRITERION_ATTRS
-        }
+        )
+
+
+# A criterion flattened for fast scoring:
+# (entity_id, state, profile, color, brightness, other attributes)
+type CompiledCriterion = tuple[
+    str,
+    str,
+    str | None,
+    NormalizedColor | None,
+    int | None,
+    tuple[tuple[str, Any], ...],
+]
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Scene:
     """A named scene that applies states to entities."""
 
     name: str
     states: Mapping[str, State]
     criteria: Mapping[str, Criterion]
+    compiled_criteria: tuple[CompiledCriterion, ...]
     transition: float | None
     icon: str | None
     unique_id: str | None
@@ -377,12 +447,33 @@ class Scene:
     @staticmethod
     def from_config(config: ConfigType) -> Scene:
         states = config.get(CONF_ENTITIES)
+        criteria = {entity_id: Criterion(state) for entity_id, state in states.items()}
         return Scene(
             name=config.get(CONF_NAME),
             states=states,
-            criteria={
-                entity_id: Criterion(state) for entity_id, state in states.items()
-            },
+            criteria=criteria,
+            compiled_criteria=tuple(
+                (
+                    entity_id,
+                    criterion.state,
+                    criterion.profile,
+                    normalize_color(criterion.color)
+                    if criterion.color is not None
+                    else None,
+                    criterion.brightness,
+                    criterion.attributes,
+                )
+                # Scoring gives up at the first mismatch so check the cheapest criteria
+                # first; they still compare the state which usually decides the match.
+                for entity_id, criterion in sorted(
+                    criteria.items(),
+                    key=lambda item: (
+                        item[1].color is not None,
+                        item[1].brightness is not None,
+                        len(item[1].attributes),
+                    ),
+                )
+            ),
             transition=config.get(ATTR_TRANSITION),
             icon=config.get(CONF_ICON),
             unique_id=config.get(CONF_UNIQUE_ID),
@@ -396,9 +487,8 @@ class Scene:
             profile_name = state.attributes.get(ATTR_PROFILE)
             if profile_name is not None:
                 profile = light_profiles[profile_name]
-                new_attributes = {
-                    k: v for k, v in state.attributes.items() if k != ATTR_PROFILE
-                }
+                new_attributes = dict(state.attributes)
+                del new_attributes[ATTR_PROFILE]
                 profile.apply(
                     new_attributes,
                     set_color_and_brightness=state.state == STATE_ON,
@@ -406,7 +496,7 @@ class Scene:
                 state.attributes = ReadOnlyDict(new_attributes)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class SceneSelect:
     """Configures the scene select entity."""
 
@@ -421,29 +511,54 @@ class SceneSelect:
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class SceneGroup:
     """Configures the scene group."""
 
     name: str
     scenes: list[Scene]
+    scene_names: tuple[str, ...]
     entities: set[str]
+    # State attributes examined when guessing the active scene
+    compared_attrs: tuple[str, ...]
+    # Profiles of the lights whose profile is a criterion of any of the scenes
+    light_profiles: Mapping[str, list[LightProfile]]
     scene_select: SceneSelect | None
 
     @staticmethod
-    def from_config(config: ConfigType) -> SceneGroup:
+    def from_config(
+        config: ConfigType, light_configs: Mapping[str, LightConfig]
+    ) -> SceneGroup:
         scenes = [Scene.from_config(item) for item in config.get(CONF_SCENES)]
         return SceneGroup(
             name=config.get(CONF_NAME),
             scenes=scenes,
-            entities=set(itertools.chain(*[scene.states.keys() for scene in scenes])),
+            scene_names=tuple(scene.name for scene in scenes),
+            entities=set().union(*(scene.states.keys() for scene in scenes)),
+            compared_attrs=(
+                *COMPARED_STATE_ATTRS,
+                *sorted(
+                    {
+                        key
+                        for scene in scenes
+                        for criterion in scene.criteria.values()
+                        for key, _ in criterion.attributes
+                    }.difference(COMPARED_STATE_ATTRS)
+                ),
+            ),
+            light_profiles={
+                entity_id: light_configs[entity_id].profiles
+                for scene in scenes
+                for entity_id, criterion in scene.criteria.items()
+                if criterion.profile is not None and entity_id in light_configs
+            },
             scene_select=SceneSelect.from_config(c)
             if (c := config.get(CONF_SCENE_SELECT)) is not None
             else None,
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class SceneryConfig:
     """Configures the scenery integration."""
 
@@ -456,15 +571,15 @@ class SceneryConfig:
         light_profiles = {}
         light_configs = {}
         scene_groups = []
+        profile_lists = {}
         for item in config.get(CONF_PROFILES, []):
             light_profile = LightProfile.from_config(item)
             light_profiles[light_profile.name] = light_profile
         for item in config.get(CONF_LIGHTS, []):
-            light_config = LightConfig.from_config(item, light_profiles)
-            for entity_id in item[CONF_ENTITY_ID]:
-                light_configs[entity_id] = light_config
+            light_config = LightConfig.from_config(item, light_profiles, profile_lists)
+            light_configs.update(dict.fromkeys(item[CONF_ENTITY_ID], light_config))
         for item in config.get(CONF_SCENE_GROUPS, []):
-            scene_group = SceneGroup.from_config(item)
+            scene_group = SceneGroup.from_config(item, light_configs)
             for scene in scene_group.scenes:
                 scene._apply_profile(light_profiles)
             scene_groups.append(scene_group)
@@ -485,22 +600,12 @@ class Scenery:
         self._track_registry_unsub = None
 
     def _intercept_light_profiles(self) -> None:
-        def apply_default(
-            entity_id: str, state_on: bool | None, params: dict[str, Any]
-        ) -> bool:
-            return (
-                (config := self.scenery_config.light_configs.get(entity_id)) is not None
-                and config.profile_default is not None
-                and config.profile_default.apply(params, not state_on or not params)
-            )
-
-        def apply_light_profile(
-            name: str,
-            params: dict[str, Any],
-        ) -> bool:
-            return (
-                profile := self.scenery_config.light_profiles.get(name)
-            ) is not None and profile.apply(params)
+        # Patch the class only once per process. The handlers look up the Scenery
+        # instance of the Profiles' hass so they always use the current configuration.
+        global _profiles_intercepted  # noqa: PLW0603
+        if _profiles_intercepted:
+            return
+        _profiles_intercepted = True
 
         _profiles_apply_default = Profiles.apply_default
         _profiles_apply_profile = Profiles.apply_profile
@@ -509,12 +614,23 @@ class Scenery:
         def _handle_apply_default(
             self, entity_id: str, state_on: bool | None, params: dict[str, Any]
         ) -> None:
-            if not apply_default(entity_id, state_on, params):
+            if not (
+                (scenery := self.hass.data.get(DOMAIN)) is not None
+                and (config := scenery.scenery_config.light_configs.get(entity_id))
+                is not None
+                and config.profile_default is not None
+                and config.profile_default.apply(params, not state_on or not params)
+            ):
                 _profiles_apply_default(self, entity_id, state_on, params)
 
         @wraps(_profiles_apply_profile)
         def _handle_apply_profile(self, name: str, params: dict[str, Any]) -> None:
-            if not apply_light_profile(name, params):
+            if not (
+                (scenery := self.hass.data.get(DOMAIN)) is not None
+                and (profile := scenery.scenery_config.light_profiles.get(name))
+                is not None
+                and profile.apply(params)
+            ):
                 _profiles_apply_profile(self, name, params)
 
         Profiles.apply_default = _handle_apply_default
@@ -546,17 +662,13 @@ class Scenery:
 
     def _try_set_favorite_colors_for_entity(self, entity_id: str) -> None:
         light_config = self.scenery_config.light_configs[entity_id]
+        colors = light_config.all_favorite_colors
         with contextlib.suppress(EntityNotFound):
-            async_set_favorite_colors(
-                self.hass,
-                entity_id,
-                unique_colors(
-                    [
-                        *light_config.favorite_colors_from_profiles,
-                        *light_config.favorite_colors,
-                    ]
-                ),
-            )
+            # Leave the frontend's default favorite colors alone
+            # if there are none to set.
+            if not colors and async_get_favorite_colors(self.hass, entity_id) is None:
+                return
+            async_set_favorite_colors(self.hass, entity_id, colors)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -632,20 +744,24 @@ def async_set_favorite_colors(
     hass: HomeAssistant, entity_id: str, colors: list[Color] | None
 ) -> None:
     """Get the favorite colors of a light entity."""
-    entity = er.async_get(hass).async_get(entity_id)
+    registry = er.async_get(hass)
+    entity = registry.async_get(entity_id)
     if entity is None:
         raise EntityNotFound(f"Entity ID {entity_id} is not valid")
 
-    if (old_options := entity.options.get("light")) is None:
-        if colors is None:
-            return
+    old_options = entity.options.get("light")
+    old_colors = old_options.get("favorite_colors") if old_options is not None else None
+    if same_colors(old_colors, colors):
+        return
+
+    if old_options is None:
         options = {}
     else:
         options = {k: v for k, v in old_options.items() if k != "favorite_colors"}
     if colors is not None:
         options["favorite_colors"] = colors
 
-    er.async_get(hass).async_update_entity_options(entity_id, "light", options)
+    registry.async_update_entity_options(entity_id, "light", options)
 
 
 async def async_turn_off(
@@ -686,21 +802,28 @@ def guess_profile(
     light_attrs: Mapping[str, Any], candidates: list[LightProfile]
 ) -> LightProfile | None:
     """Guess which light profile is active by comparing light attributes."""
-    candidates = [
-        (_rank_profile(light_attrs, profile), profile) for profile in candidates
-    ]
-    candidates.sort(key=lambda x: x[0], reverse=True)
+    scored = ((_rank_profile(light_attrs, profile), profile) for profile in candidates)
     if DEBUG_SCORING:
-        _LOGGER.debug("Profile scores: %s", repr(candidates))
-    return candidates[0][1] if candidates and candidates[0][0] > 0 else None
+        scored = sorted(scored, key=lambda x: x[0], reverse=True)
+        _LOGGER.debug("Profile scores: %s", repr(scored))
+    return _best_candidate(scored)
+
+
+def _best_candidate[T](scored: Iterable[tuple[int, T]]) -> T | None:
+    # Returns the first candidate with the highest positive score.
+    best_score, best = 0, None
+    for score, candidate in scored:
+        if score > best_score:
+            best_score, best = score, candidate
+    return best
 
 
 def _rank_profile(light_attrs: Mapping[str, Any], profile: LightProfile) -> int:
     score = 0
     # Color is considered an intrinsic part of the light profile.
     # If specified, then it must match the state.
-    if profile.color is not None:
-        if not compare_state_to_color(light_attrs, profile.color):
+    if profile.normalized_color is not None:
+        if not compare_state_to_normalized_color(light_attrs, profile.normalized_color):
             return 0
         score += 2
     # Brightness is considered a more flexible part of the light profile
@@ -726,94 +849,139 @@ async def async_apply_scene(
     )
 
 
-def guess_scene(
-    scenery_config: SceneryConfig, states: Mapping[str, State], candidates: list[Scene]
-) -> Scene | None:
-    """Guess which scene is active by comparing state attributes."""
+def guess_scene(scene_group: SceneGroup, states: Mapping[str, State]) -> Scene | None:
+    """Guess which scene of a group is active by comparing state attributes."""
     profiles = {
-        id: profile.name
-        for id, state in states.items()
-        if id in scenery_config.light_configs
-        and (
-            profile := guess_profile(
-                state.attributes, scenery_config.light_configs[id].profiles
-            )
-        )
-        is not None
+        entity_id: profile.name
+        for entity_id, light_profiles in scene_group.light_profiles.items()
+        if (state := states.get(entity_id)) is not None
+        and (profile := guess_profile(state.attributes, light_profiles)) is not None
     }
-    candidates = [(_rank_scene(states, profiles, scene), scene) for scene in candidates]
-    candidates.sort(key=lambda x: x[0], reverse=True)
+    scored = (
+        (_rank_scene(states, profiles, scene), scene) for scene in scene_group.scenes
+    )
     if DEBUG_SCORING:
-        _LOGGER.debug("Scene scores: %s", repr(candidates))
-    return candidates[0][1] if candidates and candidates[0][0] > 0 else None
+        scored = sorted(scored, key=lambda x: x[0], reverse=True)
+        _LOGGER.debug("Scene scores: %s", repr(scored))
+    return _best_candidate(scored)
+
+
+# _rank_scene_fast and _rank_scene_debug must compute the same scores;
+# the debug variant also logs why a scene failed to match.
+def _rank_scene_fast(
+    states: Mapping[str, Any], profiles: Mapping[str, str], scene: Scene
+) -> int:
+    score = 0
+    states_get = states.get
+    profiles_get = profiles.get
+    for (
+        entity_id,
+        expected_state,
+        expected_profile,
+        color,
+        brightness,
+        attributes,
+    ) in scene.compiled_criteria:
+        state = states_get(entity_id)
+        if not state:
+            continue  # Ignore the state of unavailable entities
+        if expected_state != state.state:
+            return 0
+        score += 1
+        if expected_profile is not None:
+            if profiles_get(entity_id) != expected_profile:
+                return 0
+            score += 1
+        state_attrs = state.attributes
+        if color is not None:
+            if not compare_state_to_normalized_color(state_attrs, color):
+                return 0
+            score += 1
+        if brightness is not None:
+            if not compare_state_to_brightness(state_attrs, brightness):
+                return 0
+            score += 1
+        for key, value in attributes:
+            if value != state_attrs.get(key):
+                return 0
+            score += 1
+    return score
 
 
-def _rank_scene(
+def _rank_scene_debug(
     states: Mapping[str, Any], profiles: Mapping[str, str], scene: Scene
 ) -> int:
     score = 0
-    for entity_id, criterion in scene.criteria.items():
-        state = states.get(entity_id)
+    states_get = states.get
+    profiles_get = profiles.get
+    for (
+        entity_id,
+        expected_state,
+        expected_profile,
+        color,
+        brightness,
+        attributes,
+    ) in scene.compiled_criteria:
+        state = states_get(entity_id)
         if not state:
             continue  # Ignore the state of unavailable entities
-        if criterion.state != state.state:
-            if DEBUG_SCORING:
+        if expected_state != state.state:
+            _LOGGER.debug(
+                "%s / %s: failed state criterion %s, actual %s",
+                scene.name,
+                entity_id,
+                expected_state,
+                state.state,
+            )
+            return 0
+        score += 1
+        if expected_profile is not None:
+            if profiles_get(entity_id) != expected_profile:
                 _LOGGER.debug(
-                    "%s / %s: failed state criterion %s, actual %s",
+                    "%s / %s: failed profile criterion %s, actual %s",
                     scene.name,
                     entity_id,
-                    criterion.state,
-                    state.state,
+                    expected_profile,
+                    profiles_get(entity_id),
                 )
-            return 0
-        score += 1
-        if criterion.profile is not None:
-            if profiles.get(entity_id) != criterion.profile:
-                if DEBUG_SCORING:
-                    _LOGGER.debug(
-                        "%s / %s: failed profile criterion %s, actual %s",
-                        scene.name,
-                        entity_id,
-                        criterion.profile,
-                        profiles.get(entity_id),
-                    )
                 return 0
             score += 1
-        if criterion.color is not None:
-            if not compare_state_to_color(state.attributes, criterion.color):
-                if DEBUG_SCORING:
-                    _LOGGER.debug(
-                        "%s / %s: failed color criterion %s, attributes %s",
-                        scene.name,
-                        entity_id,
-                        repr(criterion.color),
-                        repr(state.attributes),
-                    )
+        state_attrs = state.attributes
+        if color is not None:
+            if not compare_state_to_normalized_color(state_attrs, color):
+                _LOGGER.debug(
+                    "%s / %s: failed color criterion %s, attributes %s",
+                    scene.name,
+                    entity_id,
+                    repr(color),
+                    repr(state_attrs),
+                )
                 return 0
             score += 1
-        if criterion.brightness is not None:
-            if not compare_state_to_brightness(state.attributes, criterion.brightness):
-                if DEBUG_SCORING:
-                    _LOGGER.debug(
-                        "%s / %s: failed brightness criterion %s, attributes %s",
-                        scene.name,
-                        entity_id,
-                        repr(criterion.brightness),
-                        repr(state.attributes),
-                    )
+        if brightness is not None:
+            if not compare_state_to_brightness(state_attrs, brightness):
+                _LOGGER.debug(
+                    "%s / %s: failed brightness criterion %s, attributes %s",
+                    scene.name,
+                    entity_id,
+                    repr(brightness),
+                    repr(state_attrs),
+                )
                 return 0
             score += 1
-        for key, value in criterion.attributes.items():
-            if value != state.attributes.get(key):
-                if DEBUG_SCORING:
-                    _LOGGER.debug(
-                        "%s / %s: failed key %s criterion %s, value %s",
-                        scene.name,
-                        entity_id,
-                        key,
-                        value,
-                        state.attributes.get(key),
-                    )
+        for key, value in attributes:
+            if value != state_attrs.get(key):
+                _LOGGER.debug(
+                    "%s / %s: failed key %s criterion %s, value %s",
+                    scene.name,
+                    entity_id,
+                    key,
+                    value,
+                    state_attrs.get(key),
+                )
                 return 0
             score += 1
     return score
+
+
+_rank_scene = _rank_scene_debug if DEBUG_SCORING else _rank_scene_fast
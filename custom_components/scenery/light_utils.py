@@ -3,7 +3,8 @@
 Refer to https://developers.home-assistant.io/docs/core/entity/light/
 """
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
 import voluptuous as vol
@@ -46,72 +47,107 @@ ANY_COLOR_ATTRS = (
     # _DEPRECATED_ATTR_KELVIN.value,
 )
 
+# Sets of the above for fast membership tests
+FAVORITE_COLOR_ATTRS_SET = frozenset(FAVORITE_COLOR_ATTRS)
+ANY_COLOR_ATTRS_SET = frozenset(ANY_COLOR_ATTRS)
+
 # Colors are mappings from light attributes to values.
 type Color = Mapping[str, Any]
 
 
-COLOR_GROUP = "color"
-COLOR_SCHEMA = vol.Schema(
-    {
-        vol.Exclusive(ATTR_COLOR_TEMP_KELVIN, COLOR_GROUP): cv.positive_int,
-        vol.Exclusive(ATTR_HS_COLOR, COLOR_GROUP): vol.All(
-            vol.Coerce(tuple),
-            vol.ExactSequence(
-                (
-                    vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
-                    vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
-                )
-            ),
-        ),
-        vol.Exclusive(ATTR_RGB_COLOR, COLOR_GROUP): vol.All(
-            vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 3)
-        ),
-        vol.Exclusive(ATTR_RGBW_COLOR, COLOR_GROUP): vol.All(
-            vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 4)
+# Validators for the value of each color attribute
+COLOR_VALIDATORS = {
+    ATTR_COLOR_TEMP_KELVIN: cv.positive_int,
+    ATTR_HS_COLOR: vol.All(
+        vol.Coerce(tuple),
+        vol.ExactSequence(
+            (
+                vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
+                vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            )
         ),
-        vol.Exclusive(ATTR_RGBWW_COLOR, COLOR_GROUP): vol.All(
-            vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 5)
-        ),
-        vol.Exclusive(ATTR_XY_COLOR, COLOR_GROUP): vol.All(
-            vol.Coerce(tuple), vol.ExactSequence((cv.small_float, cv.small_float))
-        ),
-        vol.Exclusive(ATTR_WHITE, COLOR_GROUP): vol.All(
-            vol.Coerce(int), vol.Clamp(min=0, max=255)
-        ),
-        vol.Exclusive(ATTR_COLOR_NAME, COLOR_GROUP): cv.string,
-    }
+    ),
+    ATTR_RGB_COLOR: vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 3)),
+    ATTR_RGBW_COLOR: vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 4)),
+    ATTR_RGBWW_COLOR: vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 5)),
+    ATTR_XY_COLOR: vol.All(
+        vol.Coerce(tuple), vol.ExactSequence((cv.small_float, cv.small_float))
+    ),
+    ATTR_WHITE: vol.All(vol.Coerce(int), vol.Clamp(min=0, max=255)),
+    ATTR_COLOR_NAME: cv.string,
+}
+
+COLOR_SCHEMA = vol.Schema(
+    {vol.Optional(attr): validator for attr, validator in COLOR_VALIDATORS.items()}
 )
 
 
-def _has_one_attr(value: ConfigType, attrs: tuple[str]) -> bool:
-    keys = list(value.keys())
-    return len(keys) == 1 and keys[0] in attrs
+def _has_one_attr(value: ConfigType, attrs: frozenset[str]) -> bool:
+    return len(value) == 1 and next(iter(value)) in attrs
 
 
 def is_favorite_color(value: ConfigType) -> bool:
-    return _has_one_attr(value, FAVORITE_COLOR_ATTRS)
+    return _has_one_attr(value, FAVORITE_COLOR_ATTRS_SET)
 
 
 def validate_favorite_color(value: ConfigType) -> Color:
-    if not is_favorite_color(value):
+    if not isinstance(value, Mapping) or not is_favorite_color(value):
         raise vol.Invalid(f"Must specify one of {FAVORITE_COLOR_ATTRS}")
+    # Favorite colors have exactly one attribute so validate it directly
+    # instead of walking all of COLOR_SCHEMA.
+    attr, item = next(iter(value.items()))
+    try:
+        return {attr: COLOR_VALIDATORS[attr](item)}
+    except vol.Invalid as e:
+        raise vol.Invalid(e.msg, path=[attr], error_type="dictionary value") from e
+
+
+def validate_single_color(value: ConfigType) -> ConfigType:
+    # Checked once instead of marking each attribute of COLOR_SCHEMA exclusive.
+    if len(value.keys() & ANY_COLOR_ATTRS_SET) > 1:
+        raise vol.Invalid(f"Must specify at most one of {ANY_COLOR_ATTRS}")
     return value
 
 
 def extract_color(value: ConfigType) -> Color | None:
-    color = {attr: value[attr] for attr in ANY_COLOR_ATTRS if attr in value}
-    return color if color != {} else None
+    if not (attrs := value.keys() & ANY_COLOR_ATTRS_SET):
+        return None
+    return {attr: value[attr] for attr in attrs}
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, (list, tuple)) else value
+
+
+def _color_key(color: Color) -> tuple | frozenset:
+    # Colors are unhashable mappings whose values may be lists or tuples.
+    # Most colors have a single attribute so an (attr, value) pair identifies them.
+    if len(color) == 1:
+        attr, value = next(iter(color.items()))
+        return attr, _hashable(value)
+    return frozenset((attr, _hashable(value)) for attr, value in color.items())
+
+
+def same_colors(a: list[Color] | None, b: list[Color] | None) -> bool:
+    # Tolerates lists in place of tuples, as when colors are loaded from storage.
+    if a is None or b is None:
+        return a is b
+    return len(a) == len(b) and all(
+        _color_key(a_color) == _color_key(b_color) for a_color, b_color in zip(a, b)
+    )
 
 
 def unique_colors(colors: list[Color]) -> list[Color]:
+    seen = set()
     result = []
     for color in colors:
-        if color not in result:
+        if (key := _color_key(color)) not in seen:
+            seen.add(key)
             result.append(color)
     return result
 
 
-FAVORITE_COLOR_SCHEMA = vol.All(validate_favorite_color, COLOR_SCHEMA)
+FAVORITE_COLOR_SCHEMA = validate_favorite_color
 
 
 TOLERANCE_HUE = 5
@@ -123,8 +159,9 @@ TOLERANCE_BRIGHTNESS = 2
 
 
 def compare_hue(a: any, b: any) -> bool:  # range 0 to 360
-    delta = float(a) - float(b)
-    return delta % 360 < TOLERANCE_HUE or -delta % 360 <= TOLERANCE_HUE
+    # Circular distance without modulo; the second test handles wrap-around.
+    delta = abs(float(a) - float(b))
+    return delta <= TOLERANCE_HUE or delta >= 360 - TOLERANCE_HUE
 
 
 def compare_saturation(a: any, b: any) -> bool:  # range 0 to 100
@@ -147,62 +184,154 @@ def compare_brightness(a: any, b: any) -> bool:  # range 0 to 255
     return abs(int(a) - int(b)) <= TOLERANCE_BRIGHTNESS
 
 
-def compare_state_to_color(a: Mapping[str, Any], b: Color) -> bool:
-    """Compare colors for approximate equivalence.
+def _compare_state_to_kelvin(a: Mapping[str, Any], b_kelvin: int) -> bool:
+    if (a_kelvin := a.get(ATTR_COLOR_TEMP_KELVIN)) is None:
+        return False
+    if (a_kelvin_max := a.get(ATTR_MAX_COLOR_TEMP_KELVIN)) is not None:
+        b_kelvin = min(int(b_kelvin), int(a_kelvin_max))
+    if (a_kelvin_min := a.get(ATTR_MIN_COLOR_TEMP_KELVIN)) is not None:
+        b_kelvin = max(int(b_kelvin), int(a_kelvin_min))
+    return compare_kelvin(a_kelvin, b_kelvin)
 
-    The comparison is not symmetric. It tests whether one of `a`'s color attributes
-    matches the attribute in `b`. When comparing a light state (which may have several
-    equivalent representations) to a color, set `a` to the light state's attributes.
-    """
-    if (b_color_name := b.get(ATTR_COLOR_NAME)) is not None:
-        b = {ATTR_RGB_COLOR: color_util.color_name_to_rgb(b_color_name)}
-    if b.get(ATTR_WHITE) is not None:
-        return a.get(ATTR_COLOR_MODE) == ColorMode.WHITE
-
-    if (a_kelvin := a.get(ATTR_COLOR_TEMP_KELVIN)) is not None and (
-        b_kelvin := b.get(ATTR_COLOR_TEMP_KELVIN)
-    ) is not None:
-        if (a_kelvin_max := a.get(ATTR_MAX_COLOR_TEMP_KELVIN)) is not None:
-            b_kelvin = min(int(b_kelvin), int(a_kelvin_max))
-        if (a_kelvin_min := a.get(ATTR_MIN_COLOR_TEMP_KELVIN)) is not None:
-            b_kelvin = max(int(b_kelvin), int(a_kelvin_min))
-        if compare_kelvin(a_kelvin, b_kelvin):
-            return True
 
-    if (
+def _compare_state_to_rgbww(a: Mapping[str, Any], b_rgbww: tuple) -> bool:
+    return (
         (a_rgbww := a.get(ATTR_RGBWW_COLOR)) is not None
-        and (b_rgbww := b.get(ATTR_RGBWW_COLOR)) is not None
-        and all(compare_primary(a_rgbww[i], b_rgbww[i]) for i in range(5))
-    ):
-        return True
-    if (
+        and compare_primary(a_rgbww[0], b_rgbww[0])
+        and compare_primary(a_rgbww[1], b_rgbww[1])
+        and compare_primary(a_rgbww[2], b_rgbww[2])
+        and compare_primary(a_rgbww[3], b_rgbww[3])
+        and compare_primary(a_rgbww[4], b_rgbww[4])
+    )
+
+
+def _compare_state_to_rgbw(a: Mapping[str, Any], b_rgbw: tuple) -> bool:
+    return (
         (a_rgbw := a.get(ATTR_RGBW_COLOR)) is not None
-        and (b_rgbw := b.get(ATTR_RGBW_COLOR)) is not None
-        and all(compare_primary(a_rgbw[i], b_rgbw[i]) for i in range(4))
-    ):
-        return True
-    if (
+        and compare_primary(a_rgbw[0], b_rgbw[0])
+        and compare_primary(a_rgbw[1], b_rgbw[1])
+        and compare_primary(a_rgbw[2], b_rgbw[2])
+        and compare_primary(a_rgbw[3], b_rgbw[3])
+    )
+
+
+def _compare_state_to_rgb(a: Mapping[str, Any], b_rgb: tuple) -> bool:
+    return (
         (a_rgb := a.get(ATTR_RGB_COLOR)) is not None
-        and (b_rgb := b.get(ATTR_RGB_COLOR)) is not None
-        and all(compare_primary(a_rgb[i], b_rgb[i]) for i in range(3))
-    ):
-        return True
-    if (a_hs := a.get(ATTR_HS_COLOR)) is not None and (
-        (b_hs := b.get(ATTR_HS_COLOR)) is not None
+        and compare_primary(a_rgb[0], b_rgb[0])
+        and compare_primary(a_rgb[1], b_rgb[1])
+        and compare_primary(a_rgb[2], b_rgb[2])
+    )
+
+
+def _compare_state_to_hs(a: Mapping[str, Any], b_hs: tuple) -> bool:
+    return (
+        (a_hs := a.get(ATTR_HS_COLOR)) is not None
         and compare_hue(a_hs[0], b_hs[0])
         and compare_saturation(a_hs[1], b_hs[1])
-    ):
-        return True
-    if (
+    )
+
+
+def _compare_state_to_xy(a: Mapping[str, Any], b_xy: tuple) -> bool:
+    return (
         (a_xy := a.get(ATTR_XY_COLOR)) is not None
-        and (b_xy := b.get(ATTR_XY_COLOR)) is not None
-        and all(compare_chromaticity(a_xy[i], b_xy[i]) for i in range(2))
-    ):
-        return True
+        and compare_chromaticity(a_xy[0], b_xy[0])
+        and compare_chromaticity(a_xy[1], b_xy[1])
+    )
+
+
+type StateComparator = Callable[[Mapping[str, Any], Any], bool]
+
+# Comparators for each color attribute, in the order in which they are tried
+_STATE_COMPARATORS: dict[str, StateComparator] = {
+    ATTR_COLOR_TEMP_KELVIN: _compare_state_to_kelvin,
+    ATTR_RGBWW_COLOR: _compare_state_to_rgbww,
+    ATTR_RGBW_COLOR: _compare_state_to_rgbw,
+    ATTR_RGB_COLOR: _compare_state_to_rgb,
+    ATTR_HS_COLOR: _compare_state_to_hs,
+    ATTR_XY_COLOR: _compare_state_to_xy,
+}
+
+# Color modes in which a light has no color attributes to compare
+_COLORLESS_MODES = frozenset((ColorMode.ONOFF, ColorMode.BRIGHTNESS))
+
+
+@dataclass(kw_only=True, slots=True)
+class NormalizedColor:
+    """A color prepared ahead of time for comparison with light states."""
+
+    white: bool = False
+    # The comparators for the color's attributes paired with their values
+    comparisons: tuple[tuple[StateComparator, Any], ...] = ()
+
+
+def normalize_color(color: Color) -> NormalizedColor:
+    if (color_name := color.get(ATTR_COLOR_NAME)) is not None:
+        try:
+            rgb = color_util.color_name_to_rgb(color_name)
+        except ValueError:
+            # An unknown color name never matches any light state.
+            return NormalizedColor()
+        return NormalizedColor(comparisons=((_compare_state_to_rgb, rgb),))
+    return NormalizedColor(
+        white=color.get(ATTR_WHITE) is not None,
+        comparisons=tuple(
+            (comparator, value)
+            for attr, comparator in _STATE_COMPARATORS.items()
+            if (value := color.get(attr)) is not None
+        ),
+    )
+
 
+def compare_state_to_normalized_color(a: Mapping[str, Any], b: NormalizedColor) -> bool:
+    """Compare colors for approximate equivalence.
+
+    The comparison is not symmetric. It tests whether one of `a`'s color attributes
+    matches the attribute in `b`. When comparing a light state (which may have several
+    equivalent representations) to a color, set `a` to the light state's attributes
+    and normalize the color with `normalize_color` ahead of time.
+    """
+    a_color_mode = a.get(ATTR_COLOR_MODE)
+    if b.white:
+        return a_color_mode == ColorMode.WHITE
+    # Lights report every color representation they can derive from the active
+    # color mode, so the mode alone cannot select the attribute to compare.
+    # It can however rule out lights that report no color at all.
+    if a_color_mode in _COLORLESS_MODES:
+        return False
+    for comparator, b_value in b.comparisons:
+        if comparator(a, b_value):
+            return True
     return False
 
 
+# Light state attributes examined by compare_state_to_normalized_color and
+# compare_state_to_brightness
+COMPARED_STATE_ATTRS = (
+    ATTR_COLOR_MODE,
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+    ATTR_RGBWW_COLOR,
+    ATTR_RGBW_COLOR,
+    ATTR_RGB_COLOR,
+    ATTR_HS_COLOR,
+    ATTR_XY_COLOR,
+)
+
+
+def compared_state_key(
+    a: Mapping[str, Any], attrs: tuple[str, ...] = COMPARED_STATE_ATTRS
+) -> tuple:
+    """Return the values of a light state's attributes that comparisons examine.
+
+    Light states with equal keys compare the same against any color or brightness.
+    Pass `attrs` to also cover other attributes that will be compared.
+    """
+    return tuple(map(a.get, attrs))
+
+
 def compare_state_to_brightness(a: Mapping[str, Any], b_brightness: int) -> bool:
     return (a_brightness := a.get(ATTR_BRIGHTNESS)) is not None and compare_brightness(
         a_brightness, b_brightness
@@ -46,9 +46,7 @@ def setup_platform(  # noqa: D103
     scenery = hass.data[DOMAIN]
     scenery_config = scenery.scenery_config
     add_entities(
-        [
-            SceneryScene(scene_group, scene)
-            for scene_group in scenery_config.scene_groups
-            for scene in scene_group.scenes
-        ]
+        SceneryScene(scene_group, scene)
+        for scene_group in scenery_config.scene_groups
+        for scene in scene_group.scenes
     )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import itertools
+
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.core import (
@@ -22,8 +24,9 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from . import (
     EventEntityRegistryUpdatedData,
     LightConfig,
+    LightProfile,
+    Scene,
     SceneGroup,
-    SceneryConfig,
     async_apply_scene,
     async_turn_off,
     async_turn_on,
@@ -31,6 +34,7 @@ from . import (
     guess_scene,
 )
 from .const import DOMAIN
+from .light_utils import compared_state_key
 
 
 class SceneryLightProfileSelectEntity(SelectEntity):
@@ -49,7 +53,7 @@ class SceneryLightProfileSelectEntity(SelectEntity):
             if (icon := light_config.profile_select.icon) is not None
             else "mdi:palette",
             options=[
-                *[profile.name for profile in light_config.profiles],
+                *light_config.profile_names,
                 *([self.off_option] if self.off_option is not None else []),
             ],
         )
@@ -59,6 +63,9 @@ class SceneryLightProfileSelectEntity(SelectEntity):
         self._attr_current_option = None
         self._attr_should_poll = False
         self._set_default_name()
+        # The most recently guessed profile and the state it was guessed from
+        self._guessed_state_key = None
+        self._guessed_profile = None
 
     async def async_select_option(self, option: str) -> None:  # noqa: D102
         if option == self.off_option:
@@ -67,6 +74,7 @@ class SceneryLightProfileSelectEntity(SelectEntity):
             await async_turn_on(self.hass, self.light_entity_id, option, blocking=True)
 
     async def async_added_to_hass(self) -> None:  # noqa: D102
+        self._entity_registry = er.async_get(self.hass)
         self.async_on_remove(
             async_track_entity_registry_updated_event(
                 self.hass,
@@ -90,15 +98,18 @@ class SceneryLightProfileSelectEntity(SelectEntity):
         self._async_update_name()
 
     def _async_update_name(self):
+        old_name = self._attr_name
         if (
-            light_entity := er.async_get(self.hass).async_get(self.light_entity_id)
+            light_entity := self._entity_registry.async_get(self.light_entity_id)
         ) is not None and (
             light_name := light_entity.name or light_entity.original_name
         ) is not None:
             self._attr_name = f"{light_name} {self.entity_description.name}"
         else:
             self._set_default_name()
-        self.async_write_ha_state()
+        # Registry updates that do not affect the name need no state write.
+        if self._attr_name != old_name:
+            self.async_write_ha_state()
 
     def _set_default_name(self):
         self._attr_name = f"{self.light_entity_id.removeprefix('light.')} {self.entity_description.name}"
@@ -117,29 +128,38 @@ class SceneryLightProfileSelectEntity(SelectEntity):
                 self._attr_current_option = self.off_option
                 self._attr_available = True
             elif state.state == STATE_ON:
-                profile = guess_profile(state.attributes, self.light_config.profiles)
+                profile = self._guess_profile(state)
                 self._attr_current_option = (
                     profile.name if profile is not None else None
                 )
                 self._attr_available = True
         self.async_write_ha_state()
 
+    def _guess_profile(self, state: State) -> LightProfile | None:
+        # Many state changes leave the color and brightness untouched.
+        if (key := compared_state_key(state.attributes)) != self._guessed_state_key:
+            self._guessed_state_key = key
+            self._guessed_profile = guess_profile(
+                state.attributes, self.light_config.profiles
+            )
+        return self._guessed_profile
+
 
 class ScenerySceneSelectEntity(SelectEntity):
     """Selects and activates a scene."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, scenery_config: SceneryConfig, scene_group: SceneGroup) -> None:  # noqa: D107
-        self.scenery_config = scenery_config
+    def __init__(self, scene_group: SceneGroup) -> None:  # noqa: D107
         self.scene_group = scene_group
+        self._scene_by_name = {scene.name: scene for scene in scene_group.scenes}
         self.entity_description = SelectEntityDescription(
             key="scene",
             name="Scene",
             icon=icon
             if (icon := scene_group.scene_select.icon) is not None
             else "mdi:palette",
-            options=[scene.name for scene in scene_group.scenes],
+            options=list(scene_group.scene_names),
         )
         if scene_group.scene_select.unique_id is not None:
             self._attr_unique_id = (
@@ -148,9 +168,12 @@ class ScenerySceneSelectEntity(SelectEntity):
         self._attr_current_option = None
         self._attr_should_poll = False
         self._attr_name = scene_group.name
+        # The most recently guessed scene and the states it was guessed from
+        self._guessed_states_key = None
+        self._guessed_scene = None
 
     async def async_select_option(self, option: str) -> None:  # noqa: D102
-        scene = self.scene_group.scenes[self.options.index(option)]
+        scene = self._scene_by_name[option]
         await async_apply_scene(self.hass, scene)
 
     async def async_added_to_hass(self) -> None:  # noqa: D102
@@ -166,13 +189,14 @@ class ScenerySceneSelectEntity(SelectEntity):
         self._async_update()
 
     def _async_update(self) -> None:
+        states_get = self.hass.states.get
         states = {
             entity_id: state
             for entity_id in self.scene_group.entities
-            if (state := self.hass.states.get(entity_id)) is not None
+            if (state := states_get(entity_id)) is not None
         }
         if states:
-            scene = guess_scene(self.scenery_config, states, self.scene_group.scenes)
+            scene = self._guess_scene(states)
             self._attr_current_option = scene.name if scene is not None else None
             self._attr_available = True
         else:
@@ -180,6 +204,23 @@ class ScenerySceneSelectEntity(SelectEntity):
             self._attr_available = False
         self.async_write_ha_state()
 
+    def _guess_scene(self, states: dict[str, State]) -> Scene | None:
+        # Each light change in a scene transition fires an event but often leaves
+        # the compared attributes of the other entities unchanged.
+        compared_attrs = self.scene_group.compared_attrs
+        key = tuple(
+            (
+                entity_id,
+                state.state,
+                compared_state_key(state.attributes, compared_attrs),
+            )
+            for entity_id, state in states.items()
+        )
+        if key != self._guessed_states_key:
+            self._guessed_states_key = key
+            self._guessed_scene = guess_scene(self.scene_group, states)
+        return self._guessed_scene
+
 
 def setup_platform(  # noqa: D103
     hass: HomeAssistant,
@@ -193,16 +234,16 @@ def setup_platform(  # noqa: D103
     scenery = hass.data[DOMAIN]
     scenery_config = scenery.scenery_config
     add_entities(
-        [
-            *(
+        itertools.chain(
+            (
                 SceneryLightProfileSelectEntity(light_entity_id, light_config)
                 for light_entity_id, light_config in scenery_config.light_configs.items()
                 if light_config.profile_select is not None
             ),
-            *(
-                ScenerySceneSelectEntity(scenery_config, item)
+            (
+                ScenerySceneSelectEntity(item)
                 for item in scenery_config.scene_groups
                 if item.scene_select is not None
             ),
-        ]
+        )
     )